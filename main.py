@@ -5,88 +5,298 @@ Downloads papers from multiple sources including DBLP, arXiv, and AAAI
 Handles access restrictions and finds alternative sources
 """
 
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import httpx
+from lxml import etree
+from rapidfuzz import fuzz, process
+from tqdm.auto import tqdm
+import hashlib
 import os
-import time
+import random
 import re
+import sqlite3
+import time
 from urllib.parse import urljoin, quote, urlparse
-import json
-from typing import List, Dict, Optional
+import orjson
+from typing import Any, Callable, List, Dict, Optional, Tuple
 from datetime import datetime
 
+# arXiv API endpoint and XML namespaces used in its (Atom) responses
+ARXIV_API_URL = "http://export.arxiv.org/api/query"
+ARXIV_NS = {'atom': 'http://www.w3.org/2005/Atom'}
+ARXIV_HEADERS = {'Accept': 'application/atom+xml'}
+
+# Pause after each request that actually reaches the arXiv API, to be polite
+ARXIV_API_DELAY = 0.5
+
+# Number of titles combined into one OR query by search_arxiv_batch()
+ARXIV_BATCH_SIZE = 20
+
+# Concurrency limits: papers processed at once, and open requests per host
+MAX_CONCURRENT_PAPERS = 8
+MAX_REQUESTS_PER_HOST = 2
+
+# Hosts that must see fewer concurrent requests; the arXiv API asks for one at a time
+HOST_REQUEST_LIMITS = {'export.arxiv.org': 1}
+
+# Connection pool shared by all hosts; keep-alive + HTTP/2 reuse TLS sessions
+HTTP_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+HTTP_TIMEOUT = 30.0
+
+# Read/write size when streaming PDFs to disk
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# Anything smaller is an error or landing page, not a paper
+MIN_PDF_SIZE = 10 * 1024
+
+# DBLP and arXiv update at most daily, so cached API responses stay valid for 24h
+CACHE_TTL = 24 * 60 * 60
+
+# Stale entries younger than this are revalidated with a conditional GET
+CACHE_REVALIDATE_AGE = 7 * 24 * 60 * 60
+
+# Precompiled patterns for title normalization and safe filenames
+_PUNCT_RE = re.compile(r'[^\w\s]')
+_SAFE_TITLE_RE = re.compile(r'[^\w\s-]')
+_DASH_RE = re.compile(r'[-\s]+')
+_ARXIV_EE_RE = re.compile(r'https?://(?:www\.)?arxiv\.org/(?:abs|pdf)/([\w./-]+?)(?:\.pdf)?$')
+
+# Minimum rapidfuzz token-set ratio (0-100) for two titles to count as the same paper
+TITLE_MATCH_THRESHOLD = 70
+
+
+class ResponseCache:
+    """SQLite-backed cache of API response bodies keyed by request URL and params"""
+    
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'key TEXT PRIMARY KEY, body BLOB NOT NULL, ts REAL NOT NULL, etag TEXT, last_modified TEXT)'
+        )
+        
+        # Upgrade caches created before validators were stored
+        columns = {row[1] for row in self.conn.execute('PRAGMA table_info(responses)')}
+        for column in ('etag', 'last_modified'):
+            if column not in columns:
+                self.conn.execute(f'ALTER TABLE responses ADD COLUMN {column} TEXT')
+        self.conn.commit()
+    
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict] = None) -> str:
+        """Build a stable cache key from the request URL and params"""
+        items = sorted((str(k), str(v)) for k, v in (params or {}).items())
+        return hashlib.sha256(orjson.dumps([url, items])).hexdigest()
+    
+    def get(self, key: str) -> Optional[Tuple[bytes, float, Optional[str], Optional[str]]]:
+        """Return (body, timestamp, etag, last_modified) for key, or None if missing"""
+        return self.conn.execute(
+            'SELECT body, ts, etag, last_modified FROM responses WHERE key = ?', (key,)
+        ).fetchone()
+    
+    def set(self, key: str, body: bytes, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Store a response body and its validators under key with the current timestamp"""
+        self.conn.execute(
+            'INSERT OR REPLACE INTO responses (key, body, ts, etag, last_modified) VALUES (?, ?, ?, ?, ?)',
+            (key, body, time.time(), etag, last_modified)
+        )
+        self.conn.commit()
+    
+    def touch(self, key: str):
+        """Mark the entry for key as fresh again (after a 304 Not Modified)"""
+        self.conn.execute('UPDATE responses SET ts = ? WHERE key = ?', (time.time(), key))
+        self.conn.commit()
+    
+    def close(self):
+        """Close the underlying SQLite connection"""
+        self.conn.close()
+
+
 class AAIKnowledgeGraphCrawler:
     def __init__(self, output_dir: str = "aaai_kg_papers"):
         """Initialize the crawler with output directory"""
         self.output_dir = output_dir
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        }
+        # Accept-Encoding is left to httpx, which only offers br when a brotli decoder is installed
+        
+        # HTTP client, created inside the event loop by run_async()
+        self.client: Optional[httpx.AsyncClient] = None
+        
+        # Per-host semaphores to stay polite while downloading concurrently
+        self.host_limits: Dict[str, asyncio.Semaphore] = {}
+        
+        # In-flight/finished arXiv lookups keyed by normalized title
+        self.arxiv_lookups: Dict[str, asyncio.Future] = {}
         
         # Create output directory if it doesn't exist
         os.makedirs(self.output_dir, exist_ok=True)
         
-        # Track failed downloads
+        # Cache of DBLP/arXiv API responses across runs, opened by run_async()
+        self.cache: Optional[ResponseCache] = None
+        
+        # Track failed downloads of the papers in this run
         self.failed_downloads = []
         
-    def search_dblp(self, keyword: str = "knowledge graph", venue: str = "AAAI", year: int = 2025) -> List[Dict]:
+        # Permanent failures logged by earlier runs, keyed by (paper id, URL); those
+        # URLs are not retried, but other sources for the same paper still are
+        # (delete failed_downloads.jsonl to retry everything)
+        self.failed_log = os.path.join(self.output_dir, "failed_downloads.jsonl")
+        self.permanent_failures: Dict[Tuple[str, str], Dict] = {}
+        if os.path.exists(self.failed_log):
+            with open(self.failed_log, 'rb') as f:
+                for line in f:
+                    try:
+                        failure = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        continue  # Line torn by an interrupted run
+                    if not failure.get('key') or not failure.get('url'):
+                        continue
+                    # The latest record for a paper and URL wins
+                    failed_source = (failure['key'], failure['url'])
+                    if failure.get('permanent'):
+                        self.permanent_failures[failed_source] = failure
+                    else:
+                        self.permanent_failures.pop(failed_source, None)
+        
+        # Failures are appended as they happen so a crash loses nothing; opened by run_async()
+        self._fail_fp = None
+    
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        """Return the semaphore limiting concurrent requests to the host of url"""
+        host = urlparse(url).netloc
+        if host not in self.host_limits:
+            self.host_limits[host] = asyncio.Semaphore(HOST_REQUEST_LIMITS.get(host, MAX_REQUESTS_PER_HOST))
+        return self.host_limits[host]
+    
+    async def _polite_get(self, url: str, params: Optional[Dict], headers: Optional[Dict],
+                          delay: float) -> httpx.Response:
+        """GET url, holding its host slot for delay seconds afterwards so requests are spaced out"""
+        async with self._host_limit(url):
+            response = await self.client.get(url, params=params, headers=headers)
+            await asyncio.sleep(delay)
+        return response
+    
+    async def cached_get(self, url: str, parse: Callable[[bytes], Any], params: Optional[Dict] = None,
+                         headers: Optional[Dict] = None, ttl: float = CACHE_TTL, delay: float = 0) -> Any:
+        """GET url and return parse(body), served from the on-disk cache when fresh
+        
+        Bodies are only cached once parse() accepts them, so a truncated or error
+        payload is never served from the cache. delay seconds are waited after each
+        request that goes to the network; cache hits return immediately.
+        """
+        key = ResponseCache.make_key(url, params)
+        cached = self.cache.get(key)
+        request_headers = dict(headers or {})
+        
+        if cached is not None:
+            body, ts, etag, last_modified = cached
+            age = time.time() - ts
+            if age <= ttl:
+                try:
+                    return parse(body)
+                except Exception:
+                    cached = None  # Unusable entry; fetch it again
+            
+            # Stale but recent: let the server answer 304 instead of resending the body
+            elif age <= CACHE_REVALIDATE_AGE:
+                if etag:
+                    request_headers['If-None-Match'] = etag
+                if last_modified:
+                    request_headers['If-Modified-Since'] = last_modified
+        
+        response = await self._polite_get(url, params, request_headers, delay)
+        
+        if response.status_code == 304 and cached is not None:
+            try:
+                result = parse(cached[0])
+                self.cache.touch(key)
+                return result
+            except Exception:
+                # Unusable entry; fetch the full body instead
+                response = await self._polite_get(url, params, headers, delay)
+        
+        response.raise_for_status()
+        result = parse(response.content)
+        self.cache.set(key, response.content, response.headers.get('etag'), response.headers.get('last-modified'))
+        return result
+        
+    async def search_dblp(self, keyword: str = "knowledge graph", venue: str = "AAAI", year: int = 2025) -> List[Dict]:
         """Search DBLP for papers with keyword in title from specific venue and year"""
         papers = []
         
+        # Try both the specified year and the previous year, concurrently
+        years_to_search = [year, year - 1]
+        results = await asyncio.gather(*[
+            self._search_dblp_year(keyword, venue, search_year) for search_year in years_to_search
+        ])
+        
+        # DBLP keys (or normalized titles) already collected, to skip duplicate hits
+        seen = set()
+        
+        for year_papers in results:
+            for paper in year_papers:
+                dedup_key = paper['key'] or paper['_norm_title']
+                if dedup_key in seen:
+                    continue
+                seen.add(dedup_key)
+                papers.append(paper)
+        
+        return papers
+    
+    async def _search_dblp_year(self, keyword: str, venue: str, search_year: int) -> List[Dict]:
+        """Search DBLP for papers with keyword in title from venue in a single year"""
+        papers = []
+        
         # DBLP API endpoint
         base_url = "https://dblp.org/search/publ/api"
         
-        # Try both the specified year and the previous year
-        years_to_search = [year, year - 1]
+        # Search query
+        query = f'{keyword} venue:{venue} year:{search_year}'
+        params = {
+            'q': query,
+            'format': 'json',
+            'h': 1000,  # max results
+            'f': 0      # start from
+        }
         
-        for search_year in years_to_search:
-            # Search query
-            query = f'{keyword} venue:{venue} year:{search_year}'
-            params = {
-                'q': query,
-                'format': 'json',
-                'h': 1000,  # max results
-                'f': 0      # start from
-            }
+        try:
+            print(f"\nSearching DBLP for '{keyword}' papers from {venue} {search_year}...")
+            data = await self.cached_get(
+                base_url, orjson.loads, params=params, headers={'Accept': 'application/json'}
+            )
             
-            try:
-                print(f"\nSearching DBLP for '{keyword}' papers from {venue} {search_year}...")
-                response = self.session.get(base_url, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
+            if 'result' in data and 'hits' in data['result']:
+                hits = data['result']['hits'].get('hit', [])
                 
-                if 'result' in data and 'hits' in data['result']:
-                    hits = data['result']['hits'].get('hit', [])
+                for hit in hits:
+                    info = hit.get('info', {})
+                    title = info.get('title', '')
                     
-                    for hit in hits:
-                        info = hit.get('info', {})
-                        title = info.get('title', '')
+                    # Filter by keyword in title (case-insensitive)
+                    if keyword.lower() in title.lower():
+                        paper = {
+                            'title': title,
+                            'authors': self._extract_authors(info.get('authors', {})),
+                            'year': info.get('year', ''),
+                            'venue': info.get('venue', ''),
+                            'url': info.get('url', ''),
+                            'ee': self._extract_ees(info.get('ee', [])),  # Electronic editions (often PDF links)
+                            'key': info.get('key', ''),
+                            'doi': info.get('doi', ''),
+                            'source': 'DBLP',
+                            '_norm_title': self._normalize_title(title)  # Reused by every title comparison
+                        }
                         
-                        # Filter by keyword in title (case-insensitive)
-                        if keyword.lower() in title.lower():
-                            paper = {
-                                'title': title,
-                                'authors': self._extract_authors(info.get('authors', {})),
-                                'year': info.get('year', ''),
-                                'venue': info.get('venue', ''),
-                                'url': info.get('url', ''),
-                                'ee': info.get('ee', ''),  # Electronic edition (often PDF link)
-                                'key': info.get('key', ''),
-                                'doi': info.get('doi', ''),
-                                'source': 'DBLP'
-                            }
-                            
-                            # Ensure it's from AAAI
-                            if venue.lower() in paper['venue'].lower():
-                                papers.append(paper)
-                                print(f"Found: {paper['title']} ({search_year})")
-                
-                print(f"Found {len([p for p in papers if p['year'] == str(search_year)])} papers from {search_year}")
-                
-            except Exception as e:
-                print(f"Error searching DBLP for year {search_year}: {e}")
+                        # Ensure it's from AAAI
+                        if venue.lower() in paper['venue'].lower():
+                            papers.append(paper)
+            
+            print(f"Found {len(papers)} papers from {search_year}")
+            
+        except Exception as e:
+            print(f"Error searching DBLP for year {search_year}: {e}")
         
         return papers
     
@@ -102,15 +312,32 @@ class AAIKnowledgeGraphCrawler:
                 return [authors.get('text', '')]
         return []
     
-    def search_arxiv_for_paper(self, title: str, authors: List[str] = None) -> Optional[str]:
+    def _extract_ees(self, ee_data) -> List[str]:
+        """Extract electronic edition URLs from DBLP ee data (a string, or a list for several)"""
+        if isinstance(ee_data, str):
+            return [ee_data] if ee_data else []
+        if isinstance(ee_data, list):
+            return [ee for ee in ee_data if isinstance(ee, str) and ee]
+        return []
+    
+    async def search_arxiv_for_paper(self, title: str, authors: List[str] = None,
+                                     norm_title: Optional[str] = None) -> Optional[str]:
         """Search arXiv for a specific paper by title and return PDF URL if found"""
+        if norm_title is None:
+            norm_title = self._normalize_title(title)
+        
+        # Papers with near-identical titles share a single lookup
+        if norm_title not in self.arxiv_lookups:
+            self.arxiv_lookups[norm_title] = asyncio.ensure_future(
+                self._search_arxiv_for_paper(title, authors, norm_title)
+            )
+        return await self.arxiv_lookups[norm_title]
+    
+    async def _search_arxiv_for_paper(self, title: str, authors: Optional[List[str]],
+                                      norm_title: str) -> Optional[str]:
+        """Query arXiv for a single title using several search strategies"""
         try:
-            # Clean title for search
-            search_title = re.sub(r'[^\w\s]', ' ', title)
-            search_title = ' '.join(search_title.split())[:100]  # Limit length
-            
-            # arXiv API search
-            base_url = "http://export.arxiv.org/api/query"
+            search_title = self._arxiv_search_title(title)
             
             # Try different search strategies
             search_queries = [
@@ -130,169 +357,241 @@ class AAIKnowledgeGraphCrawler:
                     'sortBy': 'relevance'
                 }
                 
-                response = self.session.get(base_url, params=params)
-                response.raise_for_status()
-                
-                # Parse XML response
-                soup = BeautifulSoup(response.content, 'xml')
-                entries = soup.find_all('entry')
+                root = await self.cached_get(
+                    ARXIV_API_URL, etree.fromstring, params=params, headers=ARXIV_HEADERS, delay=ARXIV_API_DELAY
+                )
                 
-                for entry in entries:
-                    arxiv_title = entry.find('title').text.strip()
+                for entry in root.iterfind('atom:entry', ARXIV_NS):
+                    arxiv_title = self._normalize_title(entry.findtext('atom:title', '', ARXIV_NS))
                     
                     # Check if titles match (fuzzy matching)
-                    if self._titles_match(title, arxiv_title):
-                        # Get PDF link
-                        links = entry.find_all('link')
-                        for link in links:
-                            if link.get('title') == 'pdf':
-                                pdf_url = link.get('href')
-                                # Ensure it's a PDF URL
-                                if '/pdf/' not in pdf_url:
-                                    pdf_url = pdf_url.replace('/abs/', '/pdf/') + '.pdf'
-                                
-                                print(f"  Found on arXiv: {pdf_url}")
-                                return pdf_url
-                
-                time.sleep(0.5)  # Be polite to arXiv
+                    if self._titles_match_normalized(norm_title, arxiv_title):
+                        pdf_url = self._arxiv_entry_pdf_url(entry)
+                        if pdf_url:
+                            return pdf_url
             
         except Exception as e:
-            print(f"  Error searching arXiv: {e}")
+            tqdm.write(f"Error searching arXiv for '{title}': {e}")
         
         return None
     
-    def _titles_match(self, title1: str, title2: str) -> bool:
-        """Check if two titles are similar enough to be the same paper"""
-        # Normalize titles
-        def normalize(s):
-            s = s.lower()
-            s = re.sub(r'[^\w\s]', ' ', s)
-            s = ' '.join(s.split())
-            return s
-        
-        t1 = normalize(title1)
-        t2 = normalize(title2)
-        
-        # Check exact match
-        if t1 == t2:
-            return True
-        
-        # Check if one is substring of another (common with arXiv titles)
-        if t1 in t2 or t2 in t1:
-            return True
+    async def search_arxiv_batch(self, titles: List[str]) -> Dict[str, str]:
+        """Search arXiv for many titles at once and return a title -> PDF URL mapping"""
+        found: Dict[str, str] = {}
+        best_scores: Dict[str, float] = {}
         
-        # Check word overlap
-        words1 = set(t1.split())
-        words2 = set(t2.split())
+        # Normalize each title once and query each distinct one only once
+        norm_titles = [self._normalize_title(title) for title in titles]
+        unique_titles: Dict[str, str] = {}
+        for title, norm_title in zip(titles, norm_titles):
+            unique_titles.setdefault(norm_title, title)
+        titles_to_search = list(unique_titles)
         
-        # Remove common words
-        common_words = {'the', 'a', 'an', 'of', 'in', 'on', 'at', 'to', 'for', 'and', 'or', 'with'}
-        words1 = words1 - common_words
-        words2 = words2 - common_words
-        
-        if len(words1) > 0 and len(words2) > 0:
-            overlap = len(words1 & words2) / min(len(words1), len(words2))
-            return overlap > 0.7
+        for start in range(0, len(titles_to_search), ARXIV_BATCH_SIZE):
+            chunk = titles_to_search[start:start + ARXIV_BATCH_SIZE]
+            query = '(' + ' OR '.join(f'ti:"{self._arxiv_search_title(unique_titles[t])}"' for t in chunk) + ')'
+            params = {
+                'search_query': query,
+                'max_results': len(chunk) * 5,
+                'sortBy': 'relevance'
+            }
+            
+            try:
+                root = await self.cached_get(
+                    ARXIV_API_URL, etree.fromstring, params=params, headers=ARXIV_HEADERS, delay=ARXIV_API_DELAY
+                )
+            except Exception as e:
+                tqdm.write(f"Error searching arXiv (titles {start + 1}-{start + len(chunk)}): {e}")
+                continue
+            
+            for entry in root.iterfind('atom:entry', ARXIV_NS):
+                arxiv_title = self._normalize_title(entry.findtext('atom:title', '', ARXIV_NS))
+                
+                # Match the arXiv entry back to the closest DBLP title in this chunk
+                match = process.extractOne(
+                    arxiv_title, chunk,
+                    scorer=fuzz.token_set_ratio,
+                    processor=None,
+                    score_cutoff=TITLE_MATCH_THRESHOLD
+                )
+                if match is None:
+                    continue
+                
+                matched_title, score, _ = match
+                pdf_url = self._arxiv_entry_pdf_url(entry)
+                if pdf_url and score > best_scores.get(matched_title, -1):
+                    found[matched_title] = pdf_url
+                    best_scores[matched_title] = score
         
-        return False
+        # Map the results back onto every requested title, duplicates included
+        results = {}
+        for title, norm_title in zip(titles, norm_titles):
+            pdf_url = found.get(norm_title)
+            if pdf_url:
+                results[title] = pdf_url
+        return results
+    
+    def _normalize_title(self, title: str) -> str:
+        """Lowercase a title and collapse punctuation and whitespace for comparisons"""
+        return _DASH_RE.sub(' ', _PUNCT_RE.sub(' ', title.lower())).strip()
+    
+    def _arxiv_search_title(self, title: str) -> str:
+        """Clean a title for use in an arXiv ti: query"""
+        search_title = _PUNCT_RE.sub(' ', title)
+        return ' '.join(search_title.split())[:100]  # Limit length
+    
+    def _arxiv_entry_pdf_url(self, entry) -> Optional[str]:
+        """Return the PDF URL of an arXiv Atom entry, if it has one"""
+        for link in entry.iterfind('atom:link', ARXIV_NS):
+            if link.get('title') == 'pdf':
+                pdf_url = link.get('href')
+                # Ensure it's a PDF URL
+                if '/pdf/' not in pdf_url:
+                    pdf_url = pdf_url.replace('/abs/', '/pdf/') + '.pdf'
+                return pdf_url
+        return None
+    
+    def _arxiv_pdf_from_ees(self, ees: List[str]) -> Optional[str]:
+        """Return the arXiv PDF URL for the first DBLP electronic edition pointing at arxiv.org"""
+        for ee in ees:
+            match = _ARXIV_EE_RE.match(ee)
+            if match:
+                return f"https://arxiv.org/pdf/{match.group(1)}.pdf"
+        return None
+    
+    def _titles_match_normalized(self, norm_title1: str, norm_title2: str) -> bool:
+        """Check if two titles from _normalize_title() are similar enough to be the same paper"""
+        # Token-set ratio ignores word order and extra words
+        score = fuzz.token_set_ratio(norm_title1, norm_title2)
+        return score >= TITLE_MATCH_THRESHOLD
     
-    def download_paper(self, paper: Dict, index: int) -> bool:
+    async def download_paper(self, paper: Dict, index: int) -> bool:
         """Download a single paper PDF, trying multiple sources"""
-        print(f"\n[{index}] Processing: {paper['title']}")
-        
         # Create safe filename
-        safe_title = re.sub(r'[^\w\s-]', '', paper['title'])[:80]
-        safe_title = re.sub(r'[-\s]+', '-', safe_title)
+        safe_title = _SAFE_TITLE_RE.sub('', paper['title'])[:80]
+        safe_title = _DASH_RE.sub('-', safe_title)
         filename = f"{index:03d}_{safe_title}.pdf"
         filepath = os.path.join(self.output_dir, filename)
+        part_path = filepath + '.part'
         
         # Skip if already downloaded
         if os.path.exists(filepath):
-            print(f"  Already downloaded: {filename}")
             return True
         
         # Try different sources
         pdf_url = None
         source = None
         
-        # 1. First try arXiv
-        print("  Searching arXiv...")
-        arxiv_url = self.search_arxiv_for_paper(paper['title'], paper.get('authors', []))
-        if arxiv_url:
-            pdf_url = arxiv_url
-            source = "arXiv"
-        
-        # 2. Try direct URL from DBLP if arXiv fails
-        if not pdf_url and paper.get('ee'):
-            # Check if it's already a direct PDF link
-            if paper['ee'].endswith('.pdf') or 'arxiv.org/pdf' in paper['ee']:
-                pdf_url = paper['ee']
-                source = "DBLP direct link"
-            # Skip AAAI OJS links as they require authentication
-            elif 'ojs.aaai.org' in paper['ee'] or 'doi.org/10.1609' in paper['ee']:
-                print("  Skipping AAAI OJS link (requires authentication)")
+        # 1. DBLP may already link to arXiv, which needs no API lookup
+        arxiv_ee_url = self._arxiv_pdf_from_ees(paper.get('ee', []))
+        if arxiv_ee_url:
+            pdf_url = arxiv_ee_url
+            source = "DBLP arXiv ee"
+        
+        # 2. Otherwise try arXiv: use the bulk lookup from run_async() when it found
+        # the paper, else fall back to the slower per-paper search strategies
+        if not pdf_url:
+            if '_arxiv_pdf' in paper:
+                arxiv_url = paper['_arxiv_pdf']
             else:
-                pdf_url = paper['ee']
-                source = "DBLP EE link"
+                arxiv_url = await self.search_arxiv_for_paper(
+                    paper['title'], paper.get('authors', []), paper.get('_norm_title')
+                )
+            if arxiv_url:
+                pdf_url = arxiv_url
+                source = "arXiv"
+        
+        # 3. Try direct URLs from DBLP if arXiv fails, preferring direct PDF links
+        if not pdf_url:
+            for ee in paper.get('ee', []):
+                # Check if it's already a direct PDF link
+                if ee.endswith('.pdf') or 'arxiv.org/pdf' in ee:
+                    pdf_url = ee
+                    source = "DBLP direct link"
+                    break
+                # Skip AAAI OJS links as they require authentication
+                elif 'ojs.aaai.org' in ee or 'doi.org/10.1609' in ee:
+                    tqdm.write(f"[{index}] Skipping AAAI OJS link (requires authentication)")
+                elif not pdf_url:
+                    pdf_url = ee
+                    source = "DBLP EE link"
         
         if not pdf_url:
-            print(f"  No accessible PDF found")
-            self.failed_downloads.append({
+            tqdm.write(f"[{index}] No accessible PDF found: {paper['title']}")
+            self._record_failure(paper, {
                 'index': index,
                 'title': paper['title'],
                 'reason': 'No accessible PDF URL found'
             })
             return False
         
+        # Skip a URL that failed permanently in a previous run
+        previous = self.permanent_failures.get((self._paper_id(paper), pdf_url))
+        if previous:
+            self.failed_downloads.append(dict(previous, index=index))
+            return False
+        
         # Try to download
         try:
-            print(f"  Downloading from {source}: {pdf_url}")
-            
-            response = self.session.get(pdf_url, stream=True, timeout=30, allow_redirects=True)
-            
-            # Check if we got a 403 or other error
-            if response.status_code == 403:
-                print(f"  Access forbidden (403)")
-                self.failed_downloads.append({
-                    'index': index,
-                    'title': paper['title'],
-                    'reason': f'403 Forbidden from {source}',
-                    'url': pdf_url
-                })
-                return False
-            
-            response.raise_for_status()
-            
-            # Check if it's actually a PDF
-            content_type = response.headers.get('content-type', '')
-            if 'pdf' not in content_type.lower() and not pdf_url.endswith('.pdf'):
-                print(f"  Warning: Content might not be PDF (content-type: {content_type})")
-            
-            # Download the file
-            with open(filepath, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            
-            print(f"  Downloaded successfully: {filename}")
+            async with self._host_limit(pdf_url):
+                # Validate with a HEAD request so error/landing pages are never streamed
+                reason = await self._check_pdf_url(pdf_url)
+                if reason:
+                    tqdm.write(f"[{index}] {reason}: {pdf_url}")
+                    self._record_failure(paper, {
+                        'index': index,
+                        'title': paper['title'],
+                        'reason': f'{reason} from {source}',
+                        'url': pdf_url
+                    }, permanent=True)
+                    return False
+                
+                async with self.client.stream('GET', pdf_url) as response:
+                    # Check if we got a 403 or other error
+                    if response.status_code == 403:
+                        tqdm.write(f"[{index}] Access forbidden (403): {pdf_url}")
+                        self._record_failure(paper, {
+                            'index': index,
+                            'title': paper['title'],
+                            'reason': f'403 Forbidden from {source}',
+                            'url': pdf_url
+                        }, permanent='arxiv.org/pdf/' not in pdf_url)  # arXiv 403s are rate limiting
+                        return False
+                    
+                    response.raise_for_status()
+                    
+                    # Check if it's actually a PDF
+                    content_type = response.headers.get('content-type', '')
+                    if 'pdf' not in content_type.lower() and not pdf_url.endswith('.pdf'):
+                        tqdm.write(f"[{index}] Warning: Content might not be PDF (content-type: {content_type})")
+                    
+                    # Download to a .part file so an interrupted download is never
+                    # mistaken for a finished one
+                    with open(part_path, 'wb', buffering=DOWNLOAD_CHUNK_SIZE) as f:
+                        async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                            f.write(chunk)
+                    os.replace(part_path, filepath)
+                
+                # Be polite - hold the host slot for a short, jittered delay
+                await asyncio.sleep(random.uniform(1.0, 2.0))
             
             # Save metadata
-            metadata = paper.copy()
+            metadata = self._public_fields(paper)
             metadata['download_source'] = source
             metadata['download_url'] = pdf_url
             metadata['download_date'] = datetime.now().isoformat()
             
             metadata_file = os.path.join(self.output_dir, f"{index:03d}_metadata.json")
-            with open(metadata_file, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, ensure_ascii=False, indent=2)
-            
-            # Be polite - add delay between downloads
-            time.sleep(2)
+            with open(metadata_file, 'wb') as f:
+                f.write(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
             
             return True
             
         except Exception as e:
-            print(f"  Error downloading: {e}")
-            self.failed_downloads.append({
+            tqdm.write(f"[{index}] Error downloading {pdf_url}: {e}")
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            self._record_failure(paper, {
                 'index': index,
                 'title': paper['title'],
                 'reason': str(e),
@@ -300,20 +599,72 @@ class AAIKnowledgeGraphCrawler:
             })
             return False
     
+    async def _check_pdf_url(self, pdf_url: str) -> Optional[str]:
+        """HEAD pdf_url and return why it can never be downloaded as a PDF, or None if it looks fine"""
+        # arXiv PDF links are known-good
+        if 'arxiv.org/pdf/' in pdf_url:
+            return None
+        
+        response = await self.client.head(pdf_url, timeout=10)
+        
+        # Some servers reject HEAD outright; let the GET decide
+        if response.status_code == 405:
+            return None
+        # Transient errors are raised so they are retried on the next run
+        if response.status_code >= 500 or response.status_code in (408, 429):
+            response.raise_for_status()
+        if response.status_code == 403:
+            return 'Access forbidden (403)'
+        if response.status_code >= 400:
+            return f'HTTP {response.status_code}'
+        
+        content_type = response.headers.get('content-type', '')
+        if 'pdf' not in content_type.lower() and not pdf_url.endswith('.pdf'):
+            return f'Not a PDF (content-type: {content_type})'
+        
+        content_length = response.headers.get('content-length', '')
+        if content_length.isdigit() and int(content_length) < MIN_PDF_SIZE:
+            return f'Too small to be a PDF ({content_length} bytes)'
+        
+        return None
+    
+    def _paper_id(self, paper: Dict) -> str:
+        """Return an id for paper that is stable across runs (DBLP key, else normalized title)"""
+        return paper.get('key') or paper.get('_norm_title') or self._normalize_title(paper['title'])
+    
+    def _record_failure(self, paper: Dict, failure: Dict, permanent: bool = False):
+        """Remember a failed download and append it to failed_downloads.jsonl
+        
+        URLs that failed permanently (forbidden, not a PDF, ...) are skipped by later
+        runs; transient failures (timeouts, server errors, no URL yet) are retried.
+        """
+        failure['key'] = self._paper_id(paper)
+        failure['permanent'] = permanent
+        self.failed_downloads.append(failure)
+        if 'url' in failure:
+            failed_source = (failure['key'], failure['url'])
+            if permanent:
+                self.permanent_failures[failed_source] = failure
+            else:
+                self.permanent_failures.pop(failed_source, None)
+        self._fail_fp.write(orjson.dumps(failure) + b'\n')
+        self._fail_fp.flush()
+    
+    def _public_fields(self, paper: Dict) -> Dict:
+        """Copy a paper record without internal (underscore-prefixed) fields"""
+        return {k: v for k, v in paper.items() if not k.startswith('_')}
+    
     def save_results(self, papers: List[Dict]):
         """Save all results including successful downloads and failures"""
         # Save complete paper list
         papers_file = os.path.join(self.output_dir, "all_papers.json")
-        with open(papers_file, 'w', encoding='utf-8') as f:
-            json.dump(papers, f, ensure_ascii=False, indent=2)
+        with open(papers_file, 'wb') as f:
+            f.write(orjson.dumps([self._public_fields(p) for p in papers], option=orjson.OPT_INDENT_2))
         print(f"\nSaved complete paper list to: {papers_file}")
         
-        # Save failed downloads
+        # Failed downloads are already logged to failed_downloads.jsonl as they happen
         if self.failed_downloads:
-            failed_file = os.path.join(self.output_dir, "failed_downloads.json")
-            with open(failed_file, 'w', encoding='utf-8') as f:
-                json.dump(self.failed_downloads, f, ensure_ascii=False, indent=2)
-            print(f"Saved failed downloads list to: {failed_file}")
+            print(f"Failed downloads logged in: {self.failed_log}")
             
             # Also create a simple text report
             report_file = os.path.join(self.output_dir, "download_report.txt")
@@ -338,6 +689,36 @@ class AAIKnowledgeGraphCrawler:
     
     def run(self, keyword: str = "knowledge graph", venue: str = "AAAI", year: int = 2025):
         """Main method to run the crawler"""
+        asyncio.run(self.run_async(keyword=keyword, venue=venue, year=year))
+    
+    async def run_async(self, keyword: str = "knowledge graph", venue: str = "AAAI", year: int = 2025):
+        """Run the crawler, downloading papers concurrently"""
+        async with httpx.AsyncClient(
+            http2=True,
+            headers=self.headers,
+            limits=HTTP_LIMITS,
+            timeout=HTTP_TIMEOUT,
+            follow_redirects=True
+        ) as client:
+            self.client = client
+            self.cache = ResponseCache(os.path.join(self.output_dir, "api_cache.sqlite"))
+            self._fail_fp = open(self.failed_log, 'ab')
+            self.failed_downloads = []
+            try:
+                await self._crawl(keyword, venue, year)
+            finally:
+                self.cache.close()
+                self.cache = None
+                self._fail_fp.close()
+                self._fail_fp = None
+                
+                # The client, semaphores and futures are bound to this event loop
+                self.client = None
+                self.host_limits = {}
+                self.arxiv_lookups = {}
+    
+    async def _crawl(self, keyword: str, venue: str, year: int):
+        """Search DBLP and download all matching papers"""
         print(f"=== AAAI Knowledge Graph Papers Crawler ===")
         print(f"Searching for: '{keyword}' in {venue} {year}")
         print(f"Output directory: {self.output_dir}")
@@ -345,7 +726,7 @@ class AAIKnowledgeGraphCrawler:
         print(f"Will also search {venue} {year-1} papers.\n")
         
         # Search DBLP
-        papers = self.search_dblp(keyword=keyword, venue=venue, year=year)
+        papers = await self.search_dblp(keyword=keyword, venue=venue, year=year)
         
         if not papers:
             print("\nNo papers found!")
@@ -353,18 +734,34 @@ class AAIKnowledgeGraphCrawler:
         
         print(f"\nTotal papers found: {len(papers)}")
         
+        # Look up papers on arXiv with a few batched queries, skipping those
+        # whose DBLP electronic edition already points at arXiv
+        print("\nSearching arXiv...")
+        to_lookup = [paper for paper in papers if not self._arxiv_pdf_from_ees(paper.get('ee', []))]
+        arxiv_urls = await self.search_arxiv_batch([paper['title'] for paper in to_lookup])
+        for paper in to_lookup:
+            if paper['title'] in arxiv_urls:
+                paper['_arxiv_pdf'] = arxiv_urls[paper['title']]
+        print(f"Found {len(arxiv_urls)} papers on arXiv")
+        
         # Download papers
         print(f"\nStarting download process...")
         print("Will try multiple sources: arXiv, direct links, etc.")
         print("Note: AAAI official PDFs require institutional access.\n")
         
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_PAPERS)
         success_count = 0
-        for i, paper in enumerate(papers, 1):
-            if self.download_paper(paper, i):
-                success_count += 1
+        
+        with tqdm(total=len(papers), desc='Download', unit='paper') as progress:
+            async def bounded_download(paper: Dict, index: int):
+                nonlocal success_count
+                async with semaphore:
+                    if await self.download_paper(paper, index):
+                        success_count += 1
+                progress.set_postfix(downloaded=success_count, failed=len(self.failed_downloads), refresh=False)
+                progress.update()
             
-            print(f"\nProgress: {i}/{len(papers)} papers processed")
-            print(f"Downloaded: {success_count}, Failed: {len(self.failed_downloads)}")
+            await asyncio.gather(*[bounded_download(paper, i) for i, paper in enumerate(papers, 1)])
         
         # Save all results
         self.save_results(papers)
@@ -376,7 +773,7 @@ class AAIKnowledgeGraphCrawler:
         
         if self.failed_downloads:
             print(f"\nFailed downloads: {len(self.failed_downloads)}")
-            print("Check 'failed_downloads.json' for details.")
+            print("Check 'failed_downloads.jsonl' for details.")
             print("\nCommon reasons for failures:")
             print("- Papers behind AAAI paywall (try institutional access)")
             print("- Papers not yet on arXiv")
@@ -406,6 +803,6 @@ def main():
 
 if __name__ == "__main__":
     # Install required packages:
-    # pip install requests beautifulsoup4 lxml
+    # pip install httpx[http2,brotli] lxml rapidfuzz orjson tqdm
     
     main()